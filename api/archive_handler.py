@@ -4,8 +4,13 @@ import zipfile
 import tarfile
 import gzip
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from .file_operations import FileOperationError
 
+# Archives with fewer members are extracted on the calling thread
+PARALLEL_EXTRACT_MIN = 32
+
 class ArchiveHandler:
     SUPPORTED_FORMATS = ['.zip', '.tar', '.tar.gz', '.tgz', '.gz']
     
@@ -70,11 +75,41 @@ class ArchiveHandler:
     def _extract_zip(self, archive_path, destination, specific_files=None):
         """Extract ZIP file"""
         with zipfile.ZipFile(archive_path, 'r') as zf:
-            if specific_files:
-                for file in specific_files:
-                    zf.extract(file, destination)
-            else:
-                zf.extractall(destination)
+            members = specific_files or zf.infolist()
+            workers = min(os.cpu_count() or 1, len(members))
+            if workers < 2 or len(members) < PARALLEL_EXTRACT_MIN:
+                for member in members:
+                    zf.extract(member, destination)
+                return True
+            
+            if not specific_files:
+                # Resolve names once instead of in every worker
+                members = [info.filename for info in members]
+        
+        # ZipFile is not thread safe - each worker reads its own handle
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+        
+        def extract(name):
+            zf = getattr(local, 'zf', None)
+            if zf is None:
+                zf = local.zf = zipfile.ZipFile(archive_path, 'r')
+                with handles_lock:
+                    handles.append(zf)
+            try:
+                zf.extract(name, destination)
+            except FileExistsError:
+                # Another worker created the same parent directory first
+                zf.extract(name, destination)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(extract, name) for name in members]:
+                    future.result()
+        finally:
+            for zf in handles:
+                zf.close()
         return True
     
     def _extract_tar(self, archive_path, destination, specific_files=None):
@@ -6,6 +6,15 @@ import hashlib
 import threading
 from collections import OrderedDict
 
+# Most recent background save, see CacheManager.save_cache_async()
+_save_thread = None
+
+def wait_for_save(timeout=2.0):
+    """Wait for a pending background cache save to finish"""
+    thread = _save_thread
+    if thread is not None and thread.is_alive():
+        thread.join(timeout)
+
 class CacheManager:
     """
     File metadata cache manager for performance optimization
@@ -27,10 +36,16 @@ class CacheManager:
         self.hits = 0
         self.misses = 0
         self.cache_file = "/tmp/afm_cache.json"
+        self._dirty = False
         
         # Load persistent cache
         self.load_cache()
     
+    @property
+    def dirty(self):
+        """True if the cache changed since it was loaded or saved"""
+        return self._dirty
+    
     def _get_key(self, path):
         """Generate cache key from path"""
         return hashlib.md5(path.encode('utf-8')).hexdigest()
@@ -92,6 +107,7 @@ class CacheManager:
                 'data': data
             }
             self.cache.move_to_end(key)
+            self._dirty = True
     
     def invalidate(self, path):
         """Remove specific path from cache"""
@@ -100,6 +116,7 @@ class CacheManager:
         with self.lock:
             if key in self.cache:
                 del self.cache[key]
+                self._dirty = True
     
     def invalidate_directory(self, directory):
         """Remove all entries under directory"""
@@ -111,6 +128,9 @@ class CacheManager:
             
             for key in keys_to_remove:
                 del self.cache[key]
+            
+            if keys_to_remove:
+                self._dirty = True
     
     def clear(self):
         """Clear all cached data"""
@@ -118,6 +138,7 @@ class CacheManager:
             self.cache.clear()
             self.hits = 0
             self.misses = 0
+            self._dirty = True
     
     def get_stats(self):
         """Get cache statistics"""
@@ -146,15 +167,34 @@ class CacheManager:
                     if current_time - entry['timestamp'] < self.expire_time:
                         valid_entries[key] = entry
                 
-                # Save to file
-                with open(self.cache_file, 'w') as f:
+                # Write a temp file and swap it in, so readers never see a partial file
+                tmp_file = self.cache_file + ".tmp"
+                with open(tmp_file, 'w') as f:
                     json.dump(valid_entries, f)
+                os.replace(tmp_file, self.cache_file)
+                
+                self._dirty = False
                     
         except Exception as e:
             print(f"Cache save error: {e}")
     
+    def save_cache_async(self):
+        """
+        Save cache on a daemon thread and return immediately
+        
+        Returns:
+            threading.Thread: The thread performing the save
+        """
+        global _save_thread
+        _save_thread = threading.Thread(target=self.save_cache, daemon=True)
+        _save_thread.start()
+        return _save_thread
+    
     def load_cache(self):
         """Load cache from persistent storage"""
+        # Pick up a save still running from a previous session
+        wait_for_save()
+        
         try:
             if os.path.exists(self.cache_file):
                 with open(self.cache_file, 'r') as f:
@@ -171,6 +211,7 @@ class CacheManager:
     def __del__(self):
         """Destructor - save cache on exit"""
         try:
-            self.save_cache()
+            if self._dirty:
+                self.save_cache()
         except:
             pass
\ No newline at end of file
@@ -2,6 +2,7 @@
 import os
 import re
 import fnmatch
+import queue
 import threading
 from threading import Thread, Event
 from Components.config import config
@@ -13,7 +14,7 @@ class SearchEngine:
         self.results = []
         self.progress_callback = None
     
-    def search(self, path, pattern, options=None):
+    def search(self, path, pattern, options=None, result_queue=None):
         """
         Advanced search with pattern matching and filters
         
@@ -27,61 +28,98 @@ class SearchEngine:
         - date_after: Modified after timestamp (default: None)
         - date_before: Modified before timestamp (default: None)
         - content_search: Search within file contents (default: False)
+        
+        If result_queue (a bounded queue.Queue) is given, matches are put
+        there as they are found instead of being collected in results,
+        followed by None once the search is complete.
         """
         options = options or {}
-        self.stop_event.clear()
+        # Fresh event per search: a previous worker stuck in a slow scandir
+        # must not be revived by clearing a shared one
+        self.stop_event.set()
+        self.stop_event = Event()
         self.results = []
         
         self.search_thread = Thread(
             target=self._search_worker,
-            args=(path, pattern, options)
+            args=(path, pattern, options, result_queue, self.stop_event),
+            daemon=True
         )
         self.search_thread.start()
     
-    def _search_worker(self, path, pattern, options):
-        """Background search worker"""
+    def iter_search(self, path, pattern, options=None, stop_event=None):
+        """
+        Yield matching file paths as they are found
+        
+        Takes the same options as search() and stops early once stop()
+        is called (or stop_event is set), so callers never hold more
+        than the current match.
+        """
+        options = options or {}
+        stop_event = stop_event or self.stop_event
         recursive = options.get('recursive', True)
         case_sensitive = options.get('case_sensitive', False)
         use_regex = options.get('regex', False)
         file_types = options.get('file_types', [])
+        show_hidden = config.plugins.advancedfilemanager.showhidden.value
         
         flags = 0 if case_sensitive else re.IGNORECASE
         
-        try:
-            if recursive:
-                for root, dirs, files in os.walk(path):
-                    if self.stop_event.is_set():
-                        break
-                    
-                    # Skip hidden directories if not showing hidden
-                    if not config.plugins.advancedfilemanager.showhidden.value:
-                        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        pending = [path]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            
+            with entries:
+                for entry in entries:
+                    if stop_event.is_set():
+                        return
                     
-                    for filename in files:
-                        if self.stop_event.is_set():
-                            return
-                        
-                        if self._match_file(filename, pattern, use_regex, flags, file_types):
-                            full_path = os.path.join(root, filename)
-                            if self._match_filters(full_path, options):
-                                self.results.append(full_path)
-                                if self.progress_callback:
-                                    self.progress_callback(full_path)
-            else:
-                for filename in os.listdir(path):
-                    if self.stop_event.is_set():
-                        break
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Skip hidden directories if not showing hidden
+                            if recursive and (show_hidden or not entry.name.startswith('.')):
+                                pending.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
                     
-                    full_path = os.path.join(path, filename)
-                    if os.path.isfile(full_path):
-                        if self._match_file(filename, pattern, use_regex, flags, file_types):
-                            if self._match_filters(full_path, options):
-                                self.results.append(full_path)
-                                if self.progress_callback:
-                                    self.progress_callback(full_path)
+                    if self._match_file(entry.name, pattern, use_regex, flags, file_types):
+                        if self._match_filters(entry.path, options):
+                            yield entry.path
+    
+    def _search_worker(self, path, pattern, options, result_queue, stop_event):
+        """Background search worker"""
+        try:
+            for full_path in self.iter_search(path, pattern, options, stop_event):
+                if result_queue is not None:
+                    if not self._put_result(result_queue, full_path, stop_event):
+                        return
+                else:
+                    self.results.append(full_path)
+                    if self.progress_callback:
+                        self.progress_callback(full_path)
         
         except Exception as e:
             print(f"Search error: {e}")
+        
+        # End marker for streaming consumers
+        if result_queue is not None:
+            self._put_result(result_queue, None, stop_event)
+    
+    def _put_result(self, result_queue, item, stop_event):
+        """Queue a result, waiting while the consumer catches up"""
+        while not stop_event.is_set():
+            try:
+                result_queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                pass
+        return False
     
     def _match_file(self, filename, pattern, use_regex, flags, file_types):
         """Check if filename matches pattern"""
@@ -35,6 +35,7 @@ config.plugins.advancedfilemanager.sftp_timeout = ConfigInteger(default=30, limi
 config.plugins.advancedfilemanager.enable_media = ConfigYesNo(default=True)
 config.plugins.advancedfilemanager.autoplay_next = ConfigYesNo(default=True)
 config.plugins.advancedfilemanager.auto_load_subtitles = ConfigYesNo(default=True)
+config.plugins.advancedfilemanager.preload_media = ConfigYesNo(default=True)
 
 # Cache settings
 config.plugins.advancedfilemanager.enable_cache = ConfigYesNo(default=True)
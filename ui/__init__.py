@@ -3,11 +3,13 @@ from .filemanager import AdvancedFileManager
 from .dual_pane import DualPaneLayout
 from .context_menu import ContextMenu, ArchiveContextMenu
 from .setup_wizard import SetupWizard
+from .search_results import SearchResults
 
 __all__ = [
     'AdvancedFileManager',
     'DualPaneLayout',
     'ContextMenu',
     'ArchiveContextMenu',
-    'SetupWizard'
+    'SetupWizard',
+    'SearchResults'
 ]
\ No newline at end of file
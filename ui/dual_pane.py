@@ -7,6 +7,23 @@ from Components.Sources.StaticText import StaticText
 from enigma import eListboxPythonMultiContent, gFont, RT_HALIGN_LEFT, RT_VALIGN_CENTER
 import os
 
+from ..utils.helpers import VIDEO_EXTS, AUDIO_EXTS, IMAGE_EXTS, ARCHIVE_SUFFIXES
+
+# List icons, resolved once per row when a directory is loaded
+_PARENT_ICON = "[..]"
+_DIR_ICON = "[DIR]"
+_LINK_ICON = "[LNK]"
+_ARCHIVE_ICON = "[ARC]"
+_DEFAULT_ICON = "     "
+_ICON_MAP = {}
+for _ext in VIDEO_EXTS:
+    _ICON_MAP[_ext] = "[VID]"
+for _ext in AUDIO_EXTS:
+    _ICON_MAP[_ext] = "[AUD]"
+for _ext in IMAGE_EXTS:
+    _ICON_MAP[_ext] = "[IMG]"
+del _ext
+
 class DualPaneLayout:
     """
     Dual-pane file manager layout handler
@@ -26,10 +43,26 @@ class DualPaneLayout:
         self.left_files = []
         self.right_files = []
         
+        # Number of entries excluding the parent link
+        self.left_count = 0
+        self.right_count = 0
+        
+        # Index of the first real entry (1 when a parent link is shown)
+        self.left_content_start = 0
+        self.right_content_start = 0
+        
+        # File paths bucketed by lowercase extension
+        self.left_ext_buckets = {}
+        self.right_ext_buckets = {}
+        
         # Selections
         self.left_selected = set()
         self.right_selected = set()
         
+        # Frozen snapshots handed out by get_active_selections()
+        self.left_selected_frozen = frozenset()
+        self.right_selected_frozen = frozenset()
+        
         # UI Components
         self.left_list = None
         self.right_list = None
@@ -64,14 +97,16 @@ class DualPaneLayout:
         try:
             items = []
             
-            # Parent directory
+            # Parent directory - always the first row when present
             parent = os.path.dirname(path)
-            if parent != path:
+            start = 1 if parent != path else 0
+            if start:
                 items.append({
                     'name': '..',
                     'path': parent,
                     'is_dir': True,
                     'is_parent': True,
+                    'icon': _PARENT_ICON,
                     'size': 0,
                     'modified': 0
                 })
@@ -89,6 +124,7 @@ class DualPaneLayout:
             # Separate dirs and files
             dirs = []
             files = []
+            ext_buckets = {}
             
             for entry in entries:
                 # Skip hidden files if configured
@@ -106,11 +142,22 @@ class DualPaneLayout:
                     is_dir = os.path.isdir(full_path)
                     is_link = os.path.islink(full_path)
                     
+                    if is_dir:
+                        ext = None
+                        icon = _LINK_ICON if is_link else _DIR_ICON
+                    else:
+                        ext = os.path.splitext(entry)[1].lower()
+                        icon = _ICON_MAP.get(ext)
+                        if icon is None:
+                            # Same test as openFile, so .tar.gz is an archive but .gz is not
+                            icon = _ARCHIVE_ICON if entry.lower().endswith(ARCHIVE_SUFFIXES) else _DEFAULT_ICON
+                    
                     item = {
                         'name': entry,
                         'path': full_path,
                         'is_dir': is_dir,
                         'is_link': is_link,
+                        'icon': icon,
                         'size': stat.st_size if not is_dir else 0,
                         'modified': stat.st_mtime,
                         'mode': stat.st_mode
@@ -120,6 +167,7 @@ class DualPaneLayout:
                         dirs.append(item)
                     else:
                         files.append(item)
+                        ext_buckets.setdefault(ext, []).append(full_path)
                         
                 except (OSError, IOError) as e:
                     # Skip files we can't access
@@ -131,16 +179,23 @@ class DualPaneLayout:
             
             items.extend(dirs)
             items.extend(files)
+            count = len(items) - start
             
             # Update panel
             if panel == 'left':
                 self.left_files = items
+                self.left_count = count
+                self.left_content_start = start
+                self.left_ext_buckets = ext_buckets
                 self.left_path = path
                 if hasattr(self.screen, 'updateLeftPath'):
                     self.screen.updateLeftPath(path)
                 self.update_list('left')
             else:
                 self.right_files = items
+                self.right_count = count
+                self.right_content_start = start
+                self.right_ext_buckets = ext_buckets
                 self.right_path = path
                 if hasattr(self.screen, 'updateRightPath'):
                     self.screen.updateRightPath(path)
@@ -173,14 +228,7 @@ class DualPaneLayout:
     def format_item(self, item, is_selected):
         """Format item for display"""
         name = item['name']
-        
-        # Add indicators
-        if item.get('is_parent'):
-            icon = "[..]"
-        elif item['is_dir']:
-            icon = "[DIR]" if not item.get('is_link') else "[LNK]"
-        else:
-            icon = "    "
+        icon = item['icon']
         
         # Format size
         if item['is_dir']:
@@ -226,15 +274,60 @@ class DualPaneLayout:
         """Get file list of active panel"""
         return self.left_files if self.active_panel == 'left' else self.right_files
     
+    def get_active_count(self):
+        """Get number of entries in active panel, excluding the parent link"""
+        return self.left_count if self.active_panel == 'left' else self.right_count
+    
+    def get_active_content_start(self):
+        """Get index of the first entry after the parent link in active panel"""
+        return self.left_content_start if self.active_panel == 'left' else self.right_content_start
+    
+    def get_files_by_ext(self, path):
+        """
+        Get extension buckets for a directory shown in either panel
+        
+        Returns:
+            dict: extension -> list of file paths, or None if not loaded
+        """
+        if path == self.left_path:
+            return self.left_ext_buckets
+        if path == self.right_path:
+            return self.right_ext_buckets
+        return None
+    
     def get_active_selections(self):
-        """Get selected items of active panel"""
-        return self.left_selected if self.active_panel == 'left' else self.right_selected
+        """
+        Get selected paths of active panel
+        
+        Returns:
+            frozenset: Snapshot that stays valid after the selection changes
+        """
+        if self.active_panel == 'left':
+            if self.left_selected_frozen is None:
+                self.left_selected_frozen = frozenset(self.left_selected)
+            return self.left_selected_frozen
+        
+        if self.right_selected_frozen is None:
+            self.right_selected_frozen = frozenset(self.right_selected)
+        return self.right_selected_frozen
+    
+    def get_active_selection_count(self):
+        """Get number of selected items in active panel"""
+        return len(self.left_selected if self.active_panel == 'left' else self.right_selected)
+    
+    def _edit_selections(self, panel=None):
+        """Get the mutable selection set of a panel (default: active) and drop its snapshot"""
+        if (panel or self.active_panel) == 'left':
+            self.left_selected_frozen = None
+            return self.left_selected
+        
+        self.right_selected_frozen = None
+        return self.right_selected
     
     def toggle_selection(self):
         """Toggle selection of current item"""
         panel = self.active_panel
-        files = self.get_active_files()
-        selections = self.get_active_selections()
+        selections = self._edit_selections()
         list_widget = self.get_active_list()
         
         try:
@@ -256,18 +349,17 @@ class DualPaneLayout:
         """Select all items in active panel"""
         panel = self.active_panel
         files = self.get_active_files()
-        selections = self.get_active_selections()
+        selections = self._edit_selections()
+        start = self.get_active_content_start()
         
-        for item in files:
-            if not item.get('is_parent'):
-                selections.add(item['path'])
+        selections.update(item['path'] for item in files[start:])
         
         self.update_list(panel)
     
-    def deselect_all(self):
-        """Clear all selections in active panel"""
-        panel = self.active_panel
-        selections = self.get_active_selections()
+    def deselect_all(self, panel=None):
+        """Clear all selections in a panel (default: active panel)"""
+        panel = panel or self.active_panel
+        selections = self._edit_selections(panel)
         selections.clear()
         self.update_list(panel)
     
@@ -275,9 +367,11 @@ class DualPaneLayout:
         """Invert selection in active panel"""
         panel = self.active_panel
         files = self.get_active_files()
-        selections = self.get_active_selections()
+        selections = self._edit_selections()
+        
+        start = self.get_active_content_start()
         
-        all_paths = {item['path'] for item in files if not item.get('is_parent')}
+        all_paths = {item['path'] for item in files[start:]}
         
         # Invert
         new_selection = all_paths - selections
@@ -9,9 +9,13 @@ from Components.Pixmap import Pixmap
 from Components.Slider import Slider
 from Components.Sources.StaticText import StaticText
 from Components.config import config
-from enigma import eServiceReference, getDesktop
+from enigma import eServiceReference, eTimer, getDesktop
 from Tools.Directories import resolveFilename, SCOPE_PLUGINS
 import os
+import heapq
+import importlib
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 
 # Import our modules
 from ..api.file_operations import FileOperationManager, FileOperationError
@@ -20,8 +24,11 @@ from ..api.search_engine import SearchEngine
 from ..utils.security import SecurityManager, SecurityError
 from ..utils.logger import Logger
 from ..utils.helpers import format_size, format_date, get_file_icon, sanitize_filename
+from ..utils.helpers import VIDEO_EXTS, AUDIO_EXTS, IMAGE_EXTS, ARCHIVE_SUFFIXES
+from ..utils.cachestat import uncached_bytes
 from ..ui.dual_pane import DualPaneLayout
 from ..ui.context_menu import ContextMenu, ArchiveContextMenu
+from ..ui.search_results import SearchResults
 
 # Check for optional dependencies
 try:
@@ -36,6 +43,59 @@ try:
 except ImportError:
     HAS_TRASH = False
 
+VIDEO_SUFFIXES = tuple(sorted(VIDEO_EXTS))  # for str.endswith()
+
+# Blocking file operations run here so large batches overlap their I/O
+FILE_OP_WORKERS = 4
+_file_op_pool = ThreadPoolExecutor(max_workers=FILE_OP_WORKERS)
+
+# Above this many videos the playlist is a window around the current file
+PLAYLIST_FULL_SORT_MAX = 10000
+PLAYLIST_WINDOW = 100
+
+# Copies needing more than this much data from disk get an up-front notice
+SLOW_COPY_BYTES = 256 * 1024 * 1024
+
+# Archive menu entries: (label, method called with the archive path)
+ARCHIVE_MENU = (
+    ("Extract Here", "extractArchiveHere"),
+    ("View Contents", "viewArchiveContents"),
+    ("Test Archive", "testArchive"),
+)
+
+# Media screens loaded on demand: (module under ..media, class name)
+MEDIA_CLASSES = (
+    ('video_player', 'AdvancedVideoPlayer'),
+    ('audio_player', 'AudioPlayer'),
+    ('image_viewer', 'ImageViewer'),
+)
+
+def playlist_around(paths, current):
+    """
+    Sorted playlist, trimmed to a window around current for huge directories
+    
+    Args:
+        paths: List of video paths in the directory
+        current: Path of the video being opened
+    """
+    if len(paths) <= PLAYLIST_FULL_SORT_MAX:
+        return sorted(paths)
+    
+    # Partial selection instead of sorting the whole directory
+    before = heapq.nlargest(PLAYLIST_WINDOW, (p for p in paths if p < current))
+    after = heapq.nsmallest(PLAYLIST_WINDOW, (p for p in paths if p > current))
+    before.reverse()
+    return before + [current] + after
+
+def file_ext(path):
+    """Lowercase extension of a POSIX path, as os.path.splitext(path)[1].lower()"""
+    start = path.rfind('/') + 1
+    dot = path.rfind('.')
+    # Leading dots of the name ('.bashrc', '..x') do not start an extension
+    if dot <= start or not path[start:dot].strip('.'):
+        return ''
+    return path[dot:].lower()
+
 class AdvancedFileManager(Screen):
     skin = """
     <screen name="AdvancedFileManager" position="center,center" size="1200,700" title="Advanced File Manager">
@@ -70,6 +130,20 @@ class AdvancedFileManager(Screen):
     </screen>
     """
     
+    # Status bar templates, built once rather than on every refresh
+    STATUS_PANEL = "%s panel: %d items"
+    STATUS_SELECTED = " (%d selected)"
+    STATUS_ITEMS = "%d items"
+    PANEL_LABELS = {'left': 'LEFT', 'right': 'RIGHT'}
+    PANEL_INFO = {'left': 'left_info', 'right': 'right_info'}
+    
+    # Extension -> method that opens the file
+    _DISPATCH_TABLE = {
+        **dict.fromkeys(VIDEO_EXTS, 'playVideo'),
+        **dict.fromkeys(AUDIO_EXTS, 'playAudio'),
+        **dict.fromkeys(IMAGE_EXTS, 'viewImage'),
+    }
+    
     def __init__(self, session):
         Screen.__init__(self, session)
         self.session = session
@@ -100,9 +174,30 @@ class AdvancedFileManager(Screen):
         else:
             self.cache_manager = None
         
+        # Only written back on close if it changed
+        self.initial_lastpath = config.plugins.advancedfilemanager.lastpath.value
+        
         # UI State
         self.dual_pane = None
-        self.context_menu = ContextMenu(session, self)
+        self._context_menu = None
+        self.main_menu_items = {}
+        self.archive_path = None
+        
+        # Media player classes, imported lazily or preloaded after layout
+        self.media_classes = {}
+        self.preload_timer = eTimer()
+        self.preload_timer.callback.append(self.preloadMedia)
+        
+        # Coalesces status updates during key repeat
+        self.status_timer = eTimer()
+        self.status_timer.callback.append(self.doUpdateStatus)
+        
+        # Running batch file operation, collected from the main loop
+        self.batch = None
+        # Pending page cache estimate of a copy batch, (future, item count)
+        self.copy_estimate = None
+        self.batch_timer = eTimer()
+        self.batch_timer.callback.append(self.pollBatch)
         
         # Setup UI
         self["title"] = StaticText("Advanced File Manager")
@@ -159,6 +254,29 @@ class AdvancedFileManager(Screen):
         """Called when layout is ready"""
         self.dual_pane.refresh()
         self.updateStatus()
+        
+        # Warm up the media players while the user is still browsing. The
+        # preload option is only offered (and the video player only used)
+        # with the media player enabled
+        if (config.plugins.advancedfilemanager.enable_media.value and
+                config.plugins.advancedfilemanager.preload_media.value):
+            self.preload_timer.start(500, True)
+    
+    def preloadMedia(self):
+        """Import media player modules ahead of first use"""
+        for module, name in MEDIA_CLASSES:
+            try:
+                self.getMediaClass(module, name)
+            except ImportError as e:
+                self.logger.warning(f"Cannot preload {name}: {e}")
+    
+    def getMediaClass(self, module, name):
+        """Return media screen class, importing its module on first use"""
+        cls = self.media_classes.get(name)
+        if cls is None:
+            mod = importlib.import_module('..media.' + module, package=__package__)
+            cls = self.media_classes[name] = getattr(mod, name)
+        return cls
     
     def okPressed(self):
         """Handle OK button"""
@@ -180,36 +298,18 @@ class AdvancedFileManager(Screen):
     
     def openFile(self, path):
         """Open file with appropriate handler"""
-        ext = os.path.splitext(path)[1].lower()
-        
-        # Video files
-        video_exts = ['.mp4', '.mkv', '.avi', '.ts', '.m2ts', '.mov', '.m4v', '.mpg', '.mpeg', '.vob', '.wmv', '.flv', '.webm']
-        if ext in video_exts:
-            self.playVideo(path)
-            return
-        
-        # Audio files
-        audio_exts = ['.mp3', '.flac', '.wav', '.aac', '.ogg', '.m4a', '.wma', '.opus']
-        if ext in audio_exts:
-            self.playAudio(path)
-            return
-        
-        # Image files
-        image_exts = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.raw']
-        if ext in image_exts:
-            self.viewImage(path)
-            return
-        
-        # Archives
-        archive_exts = ['.zip', '.tar', '.tar.gz', '.tgz', '.rar', '.7z', '.bz2']
-        if ext in archive_exts:
+        # Archives first - splitext() cannot see compound suffixes
+        if path.lower().endswith(ARCHIVE_SUFFIXES):
             self.handleArchive(path)
             return
         
-        # Unknown file type
+        getattr(self, self._DISPATCH_TABLE.get(file_ext(path), 'unknownType'))(path)
+    
+    def unknownType(self, path):
+        """Tell the user no application handles this file type"""
         self.session.open(
             MessageBox,
-            "Unknown file type: %s\n\nNo application associated with this file type." % ext,
+            "Unknown file type: %s\n\nNo application associated with this file type." % file_ext(path),
             MessageBox.TYPE_INFO
         )
     
@@ -217,7 +317,7 @@ class AdvancedFileManager(Screen):
         """Play video file"""
         try:
             if config.plugins.advancedfilemanager.enable_media.value:
-                from ..media.video_player import AdvancedVideoPlayer
+                AdvancedVideoPlayer = self.getMediaClass('video_player', 'AdvancedVideoPlayer')
                 ref = eServiceReference(4097, 0, path)
                 playlist = self.buildVideoPlaylist(path)
                 self.session.open(AdvancedVideoPlayer, ref, file_path=path, playlist=playlist)
@@ -233,7 +333,7 @@ class AdvancedFileManager(Screen):
     def playAudio(self, path):
         """Play audio file"""
         try:
-            from ..media.audio_player import AudioPlayer
+            AudioPlayer = self.getMediaClass('audio_player', 'AudioPlayer')
             self.session.open(AudioPlayer, file_path=path)
         except ImportError as e:
             self.logger.error(f"Cannot load audio player: {e}")
@@ -242,7 +342,7 @@ class AdvancedFileManager(Screen):
     def viewImage(self, path):
         """View image file"""
         try:
-            from ..media.image_viewer import ImageViewer
+            ImageViewer = self.getMediaClass('image_viewer', 'ImageViewer')
             self.session.open(ImageViewer, file_path=path)
         except ImportError as e:
             self.logger.error(f"Cannot load image viewer: {e}")
@@ -251,32 +351,40 @@ class AdvancedFileManager(Screen):
     def buildVideoPlaylist(self, current_file):
         """Build playlist of video files in directory"""
         directory = os.path.dirname(current_file)
-        video_exts = ['.mp4', '.mkv', '.avi', '.ts', '.m2ts', '.mov', '.m4v', '.mpg', '.mpeg', '.vob', '.wmv', '.flv', '.webm']
+        
+        # Reuse the listing a panel already holds for this directory
+        buckets = self.dual_pane.get_files_by_ext(directory)
+        if buckets is not None:
+            videos = list(chain.from_iterable(buckets.get(ext, ()) for ext in VIDEO_EXTS))
+            return playlist_around(videos, current_file)
         
         try:
-            files = sorted([f for f in os.listdir(directory) 
-                           if os.path.splitext(f)[1].lower() in video_exts])
-            
-            playlist = [os.path.join(directory, f) for f in files]
-            return playlist
+            with os.scandir(directory) as entries:
+                videos = [entry.path for entry in entries
+                          if entry.name.lower().endswith(VIDEO_SUFFIXES) and entry.is_file()]
+            return playlist_around(videos, current_file)
         except:
             return [current_file]
     
     def handleArchive(self, path):
         """Handle archive file"""
-        menu_items = [
-            ("Extract Here", lambda: self.extractArchive(path, os.path.dirname(path))),
-            ("View Contents", lambda: self.viewArchiveContents(path)),
-            ("Test Archive", lambda: self.testArchive(path)),
-        ]
-        
+        self.archive_path = path
         self.session.openWithCallback(
-            lambda choice: choice[1]() if choice else None,
+            self.archiveCallback,
             ChoiceBox,
             "Archive Options",
-            menu_items
+            [(label, index) for index, (label, _) in enumerate(ARCHIVE_MENU)]
         )
     
+    def archiveCallback(self, choice):
+        """Handle archive menu selection"""
+        if choice:
+            getattr(self, ARCHIVE_MENU[choice[1]][1])(self.archive_path)
+    
+    def extractArchiveHere(self, archive_path):
+        """Extract archive next to itself"""
+        self.extractArchive(archive_path, os.path.dirname(archive_path))
+    
     def extractArchive(self, archive_path, destination):
         """Extract archive to destination"""
         try:
@@ -309,6 +417,13 @@ class AdvancedFileManager(Screen):
             self.logger.error(f"Test failed: {e}")
             self.session.open(MessageBox, f"Test failed: {e}", MessageBox.TYPE_ERROR)
     
+    @property
+    def context_menu(self):
+        """Context menu handler, created on first use"""
+        if self._context_menu is None:
+            self._context_menu = ContextMenu(self.session, self)
+        return self._context_menu
+    
     def showContextMenu(self):
         """Show context menu for current item"""
         current_item = self.getCurrentItem()
@@ -321,27 +436,33 @@ class AdvancedFileManager(Screen):
     
     def showMainMenu(self):
         """Show main application menu"""
-        menu_items = [
-            ("New Folder", self.createFolder),
-            ("Search Files", self.searchFiles),
-            ("Toggle Hidden Files", self.toggleView),
-            ("Bookmarks", self.showBookmarks),
-        ]
-        
-        # Add optional menu items
-        if config.plugins.advancedfilemanager.enable_network.value:
-            menu_items.append(("Network", self.showNetworkMenu))
-        
-        if self.trash_manager:
-            menu_items.append(("Trash", self.showTrash))
-        
-        menu_items.append(("Settings", self.openSettings))
+        # Built once per network setting; trash availability is fixed per screen
+        enable_network = config.plugins.advancedfilemanager.enable_network.value
+        menu_items = self.main_menu_items.get(enable_network)
+        
+        if menu_items is None:
+            menu_items = [
+                ("New Folder", self.createFolder),
+                ("Search Files", self.searchFiles),
+                ("Toggle Hidden Files", self.toggleView),
+                ("Bookmarks", self.showBookmarks),
+            ]
+            
+            # Add optional menu items
+            if enable_network:
+                menu_items.append(("Network", self.showNetworkMenu))
+            
+            if self.trash_manager:
+                menu_items.append(("Trash", self.showTrash))
+            
+            menu_items.append(("Settings", self.openSettings))
+            self.main_menu_items[enable_network] = menu_items
         
         self.session.openWithCallback(
             self.mainMenuCallback,
             ChoiceBox,
             "Main Menu",
-            menu_items
+            list(menu_items)
         )
     
     def mainMenuCallback(self, choice):
@@ -394,22 +515,23 @@ class AdvancedFileManager(Screen):
         """Handle search"""
         if pattern:
             current_path = self.dual_pane.get_active_path()
-            self["status"].setText("Searching in %s..." % current_path)
             
-            # Use search engine
-            self.search_engine.search(
+            # Results stream into the screen while the search runs
+            self.session.openWithCallback(
+                self.searchResultCallback,
+                SearchResults,
+                self.search_engine,
                 current_path,
                 pattern,
-                options={'recursive': True}
-            )
-            
-            self.session.open(
-                MessageBox,
-                "Search started. Results will be shown when complete.",
-                MessageBox.TYPE_INFO,
-                timeout=3
+                {'recursive': True}
             )
     
+    def searchResultCallback(self, path):
+        """Jump to the directory of the chosen search result"""
+        if path:
+            self.dual_pane.load_directory(self.dual_pane.active_panel, os.path.dirname(path))
+            self.updateStatus()
+    
     def toggleView(self):
         """Toggle between view modes"""
         current = config.plugins.advancedfilemanager.showhidden.value
@@ -464,12 +586,7 @@ class AdvancedFileManager(Screen):
         src_path = self.dual_pane.get_active_path()
         dst_path = self.dual_pane.right_path if src_panel == "left" else self.dual_pane.left_path
         
-        selected = self.dual_pane.get_active_selections()
-        
-        if not selected:
-            current = self.getCurrentItem()
-            if current and not current.get('is_parent'):
-                selected = {current['path']}
+        selected = self.getOperationItems()
         
         if not selected:
             self["status"].setText("No items selected")
@@ -487,32 +604,59 @@ class AdvancedFileManager(Screen):
     
     def doCopy(self, items, src_path, dst_path):
         """Perform copy operation"""
-        success = 0
-        failed = []
+        if self.batchBusy():
+            return
         
-        for src in items:
-            try:
-                # Security check
-                is_safe, reason = self.security.is_safe_operation(src, dst_path, 'copy')
-                if not is_safe:
-                    failed.append((src, reason))
-                    continue
-                
-                dst = os.path.join(dst_path, os.path.basename(src))
-                self.file_ops.copy(src, dst)
-                success += 1
-            except FileOperationError as e:
-                failed.append((src, str(e)))
-            except Exception as e:
-                self.logger.error(f"Unexpected copy error: {e}")
-                failed.append((src, str(e)))
+        # Files not in the page cache stall the first read - estimate that on
+        # the pool, queued ahead of the copy jobs so it is not stuck behind them
+        self.copy_estimate = (_file_op_pool.submit(uncached_bytes, items), len(items))
+        
+        self.runBatch(self.copyItem, items, self.copyFinished, dst_path)
+        self["status"].setText("Copying %d items..." % len(items))
+    
+    def showCopyEstimate(self):
+        """Warn about a slow copy once its page cache estimate is in"""
+        future, count = self.copy_estimate
+        self.copy_estimate = None
+        try:
+            cold_bytes = future.result()
+        except Exception as e:
+            self.logger.warning(f"Cannot estimate copy size: {e}")
+            return
         
+        if cold_bytes > SLOW_COPY_BYTES:
+            self.session.open(
+                MessageBox,
+                "Copying %d items (%s to read from disk).\nThis may take a while..." % (count, format_size(cold_bytes)),
+                MessageBox.TYPE_INFO,
+                timeout=5
+            )
+    
+    def copyItem(self, src, dst_path):
+        """Copy one item into dst_path (runs on the file operation pool)"""
+        try:
+            # Security check
+            is_safe, reason = self.security.is_safe_operation(src, dst_path, 'copy')
+            if not is_safe:
+                return reason
+            
+            dst = os.path.join(dst_path, src.rpartition('/')[2])
+            self.file_ops.copy(src, dst)
+        except FileOperationError as e:
+            return str(e)
+        except Exception as e:
+            self.logger.error(f"Unexpected copy error: {e}")
+            return str(e)
+        return None
+    
+    def copyFinished(self, panel, total, success, failed):
+        """Report copy results"""
         # Refresh
         self.dual_pane.refresh()
         
         # Status
         if failed:
-            self["status"].setText("Copied %d/%d items (%d failed)" % (success, len(items), len(failed)))
+            self["status"].setText("Copied %d/%d items (%d failed)" % (success, total, len(failed)))
             # Show first few errors
             if len(failed) <= 3:
                 error_msg = "\n".join([f"{os.path.basename(item[0])}: {item[1]}" for item in failed])
@@ -528,12 +672,7 @@ class AdvancedFileManager(Screen):
         src_path = self.dual_pane.get_active_path()
         dst_path = self.dual_pane.right_path if src_panel == "left" else self.dual_pane.left_path
         
-        selected = self.dual_pane.get_active_selections()
-        
-        if not selected:
-            current = self.getCurrentItem()
-            if current and not current.get('is_parent'):
-                selected = {current['path']}
+        selected = self.getOperationItems()
         
         if not selected:
             self["status"].setText("No items selected")
@@ -548,43 +687,40 @@ class AdvancedFileManager(Screen):
     
     def doMove(self, items, src_path, dst_path):
         """Perform move operation"""
-        success = 0
-        failed = []
-        
-        for src in items:
-            try:
-                # Security check
-                is_safe, reason = self.security.is_safe_operation(src, dst_path, 'move')
-                if not is_safe:
-                    failed.append((src, reason))
-                    continue
-                
-                dst = os.path.join(dst_path, os.path.basename(src))
-                self.file_ops.move(src, dst)
-                success += 1
-            except FileOperationError as e:
-                failed.append((src, str(e)))
-            except Exception as e:
-                self.logger.error(f"Unexpected move error: {e}")
-                failed.append((src, str(e)))
-        
-        # Clear selections
-        self.dual_pane.deselect_all()
+        if self.runBatch(self.moveItem, items, self.moveFinished, dst_path):
+            self["status"].setText("Moving %d items..." % len(items))
+    
+    def moveItem(self, src, dst_path):
+        """Move one item into dst_path (runs on the file operation pool)"""
+        try:
+            # Security check
+            is_safe, reason = self.security.is_safe_operation(src, dst_path, 'move')
+            if not is_safe:
+                return reason
+            
+            dst = os.path.join(dst_path, src.rpartition('/')[2])
+            self.file_ops.move(src, dst)
+        except FileOperationError as e:
+            return str(e)
+        except Exception as e:
+            self.logger.error(f"Unexpected move error: {e}")
+            return str(e)
+        return None
+    
+    def moveFinished(self, panel, total, success, failed):
+        """Report move results"""
+        # Clear selections of the panel the move started from
+        self.dual_pane.deselect_all(panel)
         self.dual_pane.refresh()
         
         if failed:
-            self["status"].setText("Moved %d/%d items (%d failed)" % (success, len(items), len(failed)))
+            self["status"].setText("Moved %d/%d items (%d failed)" % (success, total, len(failed)))
         else:
             self["status"].setText("Moved %d items" % success)
     
     def deleteSelected(self):
         """Delete selected items"""
-        selected = self.dual_pane.get_active_selections()
-        
-        if not selected:
-            current = self.getCurrentItem()
-            if current and not current.get('is_parent'):
-                selected = {current['path']}
+        selected = self.getOperationItems()
         
         if not selected:
             self["status"].setText("No items selected")
@@ -602,37 +738,92 @@ class AdvancedFileManager(Screen):
     
     def doDelete(self, items):
         """Perform delete operation"""
-        success = 0
-        failed = []
-        
-        for path in items:
-            try:
-                # Security check
-                is_safe, reason = self.security.is_safe_operation(path, operation='delete')
-                if not is_safe:
-                    failed.append((path, reason))
-                    continue
-                
-                if self.trash_manager:
-                    self.trash_manager.trash(path)
-                else:
-                    self.file_ops.delete(path, use_trash=False)
-                success += 1
-            except (FileOperationError, TrashError) as e:
-                failed.append((path, str(e)))
-            except Exception as e:
-                self.logger.error(f"Unexpected delete error: {e}")
-                failed.append((path, str(e)))
-        
-        # Clear selections
-        self.dual_pane.deselect_all()
+        if self.runBatch(self.deleteItem, items, self.deleteFinished):
+            self["status"].setText("Deleting %d items..." % len(items))
+    
+    def deleteItem(self, path):
+        """Delete one item (runs on the file operation pool)"""
+        try:
+            # Security check
+            is_safe, reason = self.security.is_safe_operation(path, operation='delete')
+            if not is_safe:
+                return reason
+            
+            if self.trash_manager:
+                self.trash_manager.trash(path)
+            else:
+                self.file_ops.delete(path, use_trash=False)
+        except (FileOperationError, TrashError) as e:
+            return str(e)
+        except Exception as e:
+            self.logger.error(f"Unexpected delete error: {e}")
+            return str(e)
+        return None
+    
+    def deleteFinished(self, panel, total, success, failed):
+        """Report delete results"""
+        # Clear selections of the panel the delete started from
+        self.dual_pane.deselect_all(panel)
         self.dual_pane.refresh()
         
         if failed:
-            self["status"].setText("Deleted %d/%d items (%d failed)" % (success, len(items), len(failed)))
+            self["status"].setText("Deleted %d/%d items (%d failed)" % (success, total, len(failed)))
         else:
             self["status"].setText("Deleted %d items" % success)
     
+    def runBatch(self, worker, items, finish, *args):
+        """
+        Run a file operation for each item on the worker pool
+        
+        Args:
+            worker: Called as worker(item, *args), returns error string or None
+            items: Paths to process
+            finish: Called as finish(panel, total, success, failed) on the main
+                thread, panel being the one that was active when the batch started
+        
+        Returns:
+            bool: False if another batch is still running
+        """
+        if self.batchBusy():
+            return False
+        
+        futures = [(item, _file_op_pool.submit(worker, item, *args)) for item in items]
+        # The user may switch panels while the batch runs
+        self.batch = (futures, finish, self.dual_pane.active_panel)
+        self.batch_timer.start(100, False)
+        return True
+    
+    def batchBusy(self):
+        """Tell the user and return True if a batch is still running"""
+        if self.batch:
+            self["status"].setText("Another operation is still running")
+            return True
+        return False
+    
+    def pollBatch(self):
+        """Collect results once every job of the running batch is done"""
+        futures, finish, panel = self.batch
+        if not all(future.done() for item, future in futures):
+            if self.copy_estimate and self.copy_estimate[0].done():
+                self.showCopyEstimate()
+            return
+        
+        self.batch_timer.stop()
+        self.batch = None
+        # No point warning about a copy that already finished
+        self.copy_estimate = None
+        
+        success = 0
+        failed = []
+        for item, future in futures:
+            error = future.result()
+            if error is None:
+                success += 1
+            else:
+                failed.append((item, error))
+        
+        finish(panel, len(futures), success, failed)
+    
     def showFileInfo(self):
         """Show file information"""
         current = self.getCurrentItem()
@@ -681,6 +872,22 @@ class AdvancedFileManager(Screen):
         
         return None
     
+    def getOperationItems(self):
+        """Get selected paths, or the current entry if nothing is selected"""
+        selected = self.dual_pane.get_active_selections()
+        if selected:
+            return selected
+        
+        try:
+            index = self.dual_pane.get_active_list().getSelectionIndex()
+        except:
+            return set()
+        
+        files = self.dual_pane.get_active_files()
+        if self.dual_pane.get_active_content_start() <= index < len(files):
+            return {files[index]['path']}
+        return set()
+    
     def moveUp(self):
         try:
             self.dual_pane.get_active_list().up()
@@ -742,46 +949,53 @@ class AdvancedFileManager(Screen):
         self["status"].setText("Refreshed")
     
     def updateStatus(self):
+        """Schedule a status bar update, coalescing rapid navigation"""
+        self.status_timer.start(50, True)
+    
+    def doUpdateStatus(self):
         """Update status bar"""
         try:
             panel = self.dual_pane.active_panel
-            files = self.dual_pane.get_active_files()
-            selections = self.dual_pane.get_active_selections()
-            
-            count = len([f for f in files if not f.get('is_parent')])
-            sel_count = len(selections)
+            count = self.dual_pane.get_active_count()
+            sel_count = self.dual_pane.get_active_selection_count()
             
-            status = "%s panel: %d items" % (panel.upper(), count)
+            status = self.STATUS_PANEL % (self.PANEL_LABELS[panel], count)
             if sel_count > 0:
-                status += " (%d selected)" % sel_count
+                status += self.STATUS_SELECTED % sel_count
             
-            self["status"].setText(status)
+            self.updateText("status", status)
             
             # Update panel info
-            info_text = "%d items" % count
-            if panel == 'left':
-                self["left_info"].setText(info_text)
-            else:
-                self["right_info"].setText(info_text)
+            self.updateText(self.PANEL_INFO[panel], self.STATUS_ITEMS % count)
         except Exception as e:
             self.logger.error(f"Error updating status: {e}")
     
+    def updateText(self, name, text):
+        """Set widget text only when it changes, avoiding needless redraws"""
+        widget = self[name]
+        if widget.getText() != text:
+            widget.setText(text)
+    
     def close(self):
         """Clean up and close"""
+        self.preload_timer.stop()
+        self.batch_timer.stop()
+        self.status_timer.stop()
         try:
-            # Save cache
-            if self.cache_manager:
+            # Save cache in the background so the screen closes immediately
+            if self.cache_manager and self.cache_manager.dirty:
                 try:
-                    self.cache_manager.save_cache()
+                    self.cache_manager.save_cache_async()
                 except:
                     pass
             
             # Save last path
-            try:
-                config.plugins.advancedfilemanager.lastpath.value = self.dual_pane.left_path
-                config.plugins.advancedfilemanager.save()
-            except:
-                pass
+            if self.dual_pane.left_path != self.initial_lastpath:
+                try:
+                    config.plugins.advancedfilemanager.lastpath.value = self.dual_pane.left_path
+                    config.plugins.advancedfilemanager.save()
+                except:
+                    pass
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
         finally:
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from Screens.Screen import Screen
+from Components.ActionMap import ActionMap
+from Components.MenuList import MenuList
+from Components.Sources.StaticText import StaticText
+from enigma import eTimer
+import queue
+
+class SearchResults(Screen):
+    """
+    Live search results
+    Rows are appended while the search engine is still walking the tree
+    """
+    
+    skin = """
+    <screen name="AFMSearchResults" position="center,center" size="1000,600" title="Search Results">
+        <widget source="title" render="Label" position="20,10" size="960,30" font="Regular;24" foregroundColor="#ffffff" />
+        <widget name="list" position="20,50" size="960,490" scrollbarMode="showOnDemand" />
+        <widget source="status" render="Label" position="20,550" size="960,30" font="Regular;20" foregroundColor="#aaaaaa" />
+    </screen>
+    """
+    
+    # Pending matches before the search thread has to wait for the UI
+    QUEUE_SIZE = 256
+    
+    # Maximum matches moved into the list per timer tick
+    BATCH_SIZE = 64
+    
+    def __init__(self, session, search_engine, path, pattern, options=None):
+        Screen.__init__(self, session)
+        self.session = session
+        self.search_engine = search_engine
+        self.pattern = pattern
+        
+        self.results = []
+        self.finished = False
+        self.result_queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        
+        self["title"] = StaticText("Search: %s in %s" % (pattern, path))
+        self["status"] = StaticText("Searching...")
+        self["list"] = MenuList([])
+        
+        self["actions"] = ActionMap(["WizardActions", "DirectionActions"],
+        {
+            "ok": self.okPressed,
+            "back": self.cancel,
+            "up": self["list"].up,
+            "down": self["list"].down,
+            "left": self["list"].pageUp,
+            "right": self["list"].pageDown,
+        }, -1)
+        
+        self.poll_timer = eTimer()
+        self.poll_timer.callback.append(self.pollResults)
+        
+        # However the screen goes away, the search must not outlive it
+        self.onClose.append(self.stopSearch)
+        
+        self.search_engine.search(path, pattern, options, result_queue=self.result_queue)
+        self.poll_timer.start(200, False)
+    
+    def pollResults(self):
+        """Move newly found matches into the list"""
+        added = 0
+        while added < self.BATCH_SIZE:
+            try:
+                path = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if path is None:
+                self.finished = True
+                self.poll_timer.stop()
+                break
+            
+            self.results.append((path, path))
+            added += 1
+        
+        if added:
+            self["list"].setList(self.results)
+        
+        if self.finished:
+            self["status"].setText("%d files found" % len(self.results))
+        else:
+            self["status"].setText("Searching... %d files found" % len(self.results))
+    
+    def okPressed(self):
+        """Return selected match to the file manager"""
+        current = self["list"].getCurrent()
+        if current:
+            self.close(current[1])
+    
+    def cancel(self):
+        self.close(None)
+    
+    def stopSearch(self):
+        """Stop polling and the search thread"""
+        self.poll_timer.stop()
+        if not self.finished:
+            self.search_engine.stop()
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from .security import SecurityManager, SecurityError
 from .logger import Logger
-from .helpers import format_size, format_date, human_readable_time, sanitize_filename, get_file_icon
+from .helpers import format_size, format_date, human_readable_time, sanitize_filename, get_file_icon, get_file_icons_batch, get_mime_types_batch
 
 __all__ = [
     'SecurityManager',
@@ -11,5 +11,7 @@ __all__ = [
     'format_date', 
     'human_readable_time',
     'sanitize_filename',
-    'get_file_icon'
+    'get_file_icon',
+    'get_file_icons_batch',
+    'get_mime_types_batch'
 ]
\ No newline at end of file
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Page cache residency of files
+
+Uses the cachestat() syscall (Linux 6.5+) and falls back to
+mmap + mincore() on older kernels.
+"""
+import os
+import stat
+import errno
+import mmap
+import ctypes
+import ctypes.util
+import platform
+
+PAGE_SIZE = mmap.PAGESIZE
+
+# cachestat() is 451 in the unified syscall table, MIPS o32 adds 4000
+SYS_CACHESTAT = 4451 if platform.machine().startswith('mips') else 451
+
+# mincore() is run over windows of this size (a multiple of PAGE_SIZE)
+MINCORE_WINDOW = 64 * 1024 * 1024
+
+# Bytes of a mincore() vector with the "resident" bit set
+_RESIDENT = bytes(range(1, 256, 2))
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+except OSError:
+    _libc = None
+
+# Cleared once the kernel reports cachestat() as unavailable
+_has_cachestat = _libc is not None
+
+class _CachestatRange(ctypes.Structure):
+    _fields_ = [
+        ('off', ctypes.c_uint64),
+        ('len', ctypes.c_uint64),
+    ]
+
+class _Cachestat(ctypes.Structure):
+    _fields_ = [
+        ('nr_cache', ctypes.c_uint64),
+        ('nr_dirty', ctypes.c_uint64),
+        ('nr_writeback', ctypes.c_uint64),
+        ('nr_evicted', ctypes.c_uint64),
+        ('nr_recently_evicted', ctypes.c_uint64),
+    ]
+
+def _raise_errno():
+    err = ctypes.get_errno()
+    raise OSError(err, os.strerror(err))
+
+def _cachestat(fd):
+    """Cached pages of the whole file via cachestat()"""
+    crange = _CachestatRange(0, 0)  # len 0 means up to end of file
+    cstat = _Cachestat()
+    ret = _libc.syscall(ctypes.c_long(SYS_CACHESTAT), ctypes.c_long(fd),
+                        ctypes.byref(crange), ctypes.byref(cstat), ctypes.c_long(0))
+    if ret != 0:
+        _raise_errno()
+    return cstat.nr_cache
+
+def _mincore(fd, size):
+    """Cached pages of the file via mmap + mincore()"""
+    pages_cached = 0
+    offset = 0
+    while offset < size:
+        length = min(MINCORE_WINDOW, size - offset)
+        # ACCESS_COPY gives a writable buffer for ctypes without touching the file
+        mm = mmap.mmap(fd, length, access=mmap.ACCESS_COPY, offset=offset)
+        try:
+            buf = (ctypes.c_char * length).from_buffer(mm)
+            try:
+                pages = (length + PAGE_SIZE - 1) // PAGE_SIZE
+                vec = (ctypes.c_ubyte * pages)()
+                if _libc.mincore(ctypes.c_void_p(ctypes.addressof(buf)), ctypes.c_size_t(length), vec) != 0:
+                    _raise_errno()
+                pages_cached += pages - len(bytes(vec).translate(None, _RESIDENT))
+            finally:
+                del buf
+        finally:
+            mm.close()
+        offset += length
+    return pages_cached
+
+def cached_bytes(path):
+    """
+    Get how much of a regular file is in the page cache
+    
+    Args:
+        path: File path
+    
+    Returns:
+        tuple: (cached_bytes, file_size), or None if unknown
+    """
+    global _has_cachestat
+    
+    if _libc is None:
+        return None
+    
+    # Opening a FIFO would block until a writer shows up
+    try:
+        if not stat.S_ISREG(os.stat(path).st_mode):
+            return None
+        fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return None
+    
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        if st.st_size == 0:
+            return 0, 0
+        
+        if _has_cachestat:
+            try:
+                return min(_cachestat(fd) * PAGE_SIZE, st.st_size), st.st_size
+            except OSError as e:
+                # Kernels before 6.5 - stop trying and use mincore()
+                if e.errno == errno.ENOSYS:
+                    _has_cachestat = False
+        
+        try:
+            return min(_mincore(fd, st.st_size) * PAGE_SIZE, st.st_size), st.st_size
+        except (OSError, ValueError):
+            return None
+    finally:
+        os.close(fd)
+
+def uncached_bytes(paths):
+    """
+    Estimate bytes that must be read from disk for the given files
+    
+    Args:
+        paths: Iterable of file paths (non-regular files are ignored)
+    
+    Returns:
+        int: Total bytes not currently in the page cache
+    """
+    total = 0
+    for path in paths:
+        result = cached_bytes(path)
+        if result is not None:
+            cached, size = result
+            total += size - cached
+    return total
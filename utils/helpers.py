@@ -1,7 +1,99 @@
 # -*- coding: utf-8 -*-
 import os
+import re
 import time
-from datetime import datetime
+
+# File type groups used to pick viewers and list icons
+VIDEO_EXTS = frozenset({'.mp4', '.mkv', '.avi', '.ts', '.m2ts', '.mov', '.m4v', '.mpg', '.mpeg', '.vob', '.wmv', '.flv', '.webm'})
+AUDIO_EXTS = frozenset({'.mp3', '.flac', '.wav', '.aac', '.ogg', '.m4a', '.wma', '.opus'})
+IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.raw'})
+
+# Matched with str.endswith() so compound suffixes like .tar.gz work
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.rar', '.7z', '.bz2', '.xz', '.tar.xz')
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Invalid characters in most filesystems
+_INVALID_CHARS = '<>:"/\\|?*'
+
+# str.translate() table: drop control characters, replace invalid ones
+_SANITIZE_TABLE = dict.fromkeys(range(32))
+_SANITIZE_TABLE.update(dict.fromkeys(map(ord, _INVALID_CHARS), '_'))
+
+# Anything _SANITIZE_TABLE would change
+_BAD_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# statvfs() results are reused for this many seconds
+_STATVFS_TTL = 1.0
+_STATVFS_CACHE = {}  # path -> (timestamp, usage dict)
+
+# Bytes that may appear in text files, anything else marks a file as binary
+_TEXTCHARS = bytes({7, 8, 9, 10, 12, 13, 27}) + bytes(range(0x20, 0x100))
+
+# Reserved Windows names
+_RESERVED = frozenset({
+    'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
+    'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2',
+    'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+})
+_RESERVED_PREFIXES = tuple(sorted(_RESERVED))
+
+# Extension -> list icon, first category wins (.sh is code, not executable)
+_ICON_CATEGORIES = (
+    ("🎬", ('.mp4', '.mkv', '.avi', '.ts', '.m2ts', '.mov', '.m4v', '.mpg', '.mpeg', '.vob')),
+    ("🎵", ('.mp3', '.flac', '.wav', '.aac', '.ogg', '.m4a', '.wma', '.opus')),
+    ("🖼️", ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.raw')),
+    ("📦", ('.zip', '.tar', '.gz', '.bz2', '.7z', '.rar', '.tgz', '.tar.gz')),
+    ("📄", ('.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt')),
+    ("📊", ('.xls', '.xlsx', '.csv', '.ods')),
+    ("💻", ('.py', '.js', '.html', '.css', '.php', '.java', '.c', '.cpp', '.h', '.sh')),
+    ("⚙️", ('.exe', '.bin', '.sh', '.run', '.AppImage')),
+)
+
+_ICON_BY_EXT = {}
+for _icon, _exts in _ICON_CATEGORIES:
+    for _ext in _exts:
+        _ICON_BY_EXT.setdefault(_ext, _icon)
+del _icon, _exts, _ext
+
+# Extension -> MIME type
+_MIME_TYPES = {
+    # Images
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.webp': 'image/webp',
+    
+    # Video
+    '.mp4': 'video/mp4',
+    '.mkv': 'video/x-matroska',
+    '.avi': 'video/x-msvideo',
+    '.ts': 'video/mp2t',
+    '.mov': 'video/quicktime',
+    
+    # Audio
+    '.mp3': 'audio/mpeg',
+    '.flac': 'audio/flac',
+    '.wav': 'audio/wav',
+    '.ogg': 'audio/ogg',
+    '.m4a': 'audio/mp4',
+    
+    # Archives
+    '.zip': 'application/zip',
+    '.tar': 'application/x-tar',
+    '.gz': 'application/gzip',
+    '.rar': 'application/x-rar-compressed',
+    '.7z': 'application/x-7z-compressed',
+    
+    # Documents
+    '.pdf': 'application/pdf',
+    '.txt': 'text/plain',
+    '.html': 'text/html',
+    '.xml': 'application/xml',
+    '.json': 'application/json',
+}
 
 def format_size(size_bytes):
     """
@@ -19,18 +111,13 @@ def format_size(size_bytes):
     if size_bytes == 0:
         return "0 B"
     
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    unit_index = 0
+    # Every 10 bits is another factor of 1024
+    unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
     
-    size = float(size_bytes)
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
-    
-    if unit_index == 0:
-        return f"{int(size)} {units[unit_index]}"
+    if unit_index <= 0:
+        return f"{int(size_bytes)} B"
     else:
-        return f"{size:.1f} {units[unit_index]}"
+        return f"{size_bytes / (1 << unit_index * 10):.1f} {SIZE_UNITS[unit_index]}"
 
 def format_date(timestamp, format_str="%Y-%m-%d %H:%M"):
     """
@@ -43,10 +130,13 @@ def format_date(timestamp, format_str="%Y-%m-%d %H:%M"):
     Returns:
         str: Formatted date
     """
+    # localtime(None) would silently mean "now"
+    if timestamp is None:
+        return "Unknown"
+    
     try:
-        dt = datetime.fromtimestamp(timestamp)
-        return dt.strftime(format_str)
-    except:
+        return time.strftime(format_str, time.localtime(timestamp))
+    except Exception:
         return "Unknown"
 
 def human_readable_time(seconds):
@@ -62,9 +152,8 @@ def human_readable_time(seconds):
     if seconds < 0:
         return "0:00"
     
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
     
     if hours > 0:
         return f"{hours}:{minutes:02d}:{secs:02d}"
@@ -85,25 +174,23 @@ def sanitize_filename(filename, replacement='_'):
     if not filename:
         return "unnamed"
     
-    # Invalid characters in most filesystems
-    invalid_chars = '<>:"/\\|?*'
+    # Already clean names are returned as they are (the prefix check also
+    # covers exact reserved names)
+    if (len(filename) <= 255 and filename[0] not in ' .' and filename[-1] not in ' .'
+            and not _BAD_RE.search(filename)
+            and not filename.upper().startswith(_RESERVED_PREFIXES)):
+        return filename
     
-    # Replace invalid characters
-    for char in invalid_chars:
-        filename = filename.replace(char, replacement)
-    
-    # Remove control characters
-    filename = ''.join(char for char in filename if ord(char) >= 32)
+    # Replace invalid characters and remove control characters in one pass
+    table = _SANITIZE_TABLE
+    if replacement != '_':
+        table = dict(table)
+        table.update(dict.fromkeys(map(ord, _INVALID_CHARS), replacement))
+    filename = filename.translate(table)
     
     # Reserved Windows names
-    reserved = {
-        'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
-        'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2',
-        'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-    }
-    
     name_upper = filename.upper()
-    if name_upper in reserved or (name_upper.startswith(tuple(reserved)) and '.' not in name_upper):
+    if name_upper in _RESERVED or (name_upper.startswith(_RESERVED_PREFIXES) and '.' not in name_upper):
         filename = f"_{filename}"
     
     # Trim whitespace
@@ -138,43 +225,33 @@ def get_file_icon(filename, is_dir=False, is_link=False):
     if is_dir:
         return "📁"
     
-    # Get extension
     ext = os.path.splitext(filename)[1].lower()
     
-    # Video files
-    if ext in ['.mp4', '.mkv', '.avi', '.ts', '.m2ts', '.mov', '.m4v', '.mpg', '.mpeg', '.vob']:
+    # Recordings dominate receiver listings - skip the dict lookup for them
+    if ext == '.ts':
         return "🎬"
     
-    # Audio files
-    if ext in ['.mp3', '.flac', '.wav', '.aac', '.ogg', '.m4a', '.wma', '.opus']:
-        return "🎵"
-    
-    # Image files
-    if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.raw']:
-        return "🖼️"
-    
-    # Archive files
-    if ext in ['.zip', '.tar', '.gz', '.bz2', '.7z', '.rar', '.tgz', '.tar.gz']:
-        return "📦"
-    
-    # Document files
-    if ext in ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt']:
-        return "📄"
+    return _ICON_BY_EXT.get(ext, "📄")
+
+def get_file_icons_batch(filenames, is_dirs=None):
+    """
+    Get icons for many files at once
     
-    # Spreadsheet files
-    if ext in ['.xls', '.xlsx', '.csv', '.ods']:
-        return "📊"
+    Args:
+        filenames: List of filenames
+        is_dirs: Optional list of flags, same length as filenames
     
-    # Code files
-    if ext in ['.py', '.js', '.html', '.css', '.php', '.java', '.c', '.cpp', '.h', '.sh']:
-        return "💻"
+    Returns:
+        list: Icon characters
+    """
+    lookup = _ICON_BY_EXT.get
+    splitext = os.path.splitext
     
-    # Executable files
-    if ext in ['.exe', '.bin', '.sh', '.run', '.AppImage']:
-        return "⚙️"
+    if is_dirs is None:
+        return [lookup(splitext(name)[1].lower(), "📄") for name in filenames]
     
-    # Default
-    return "📄"
+    return ["📁" if is_dir else lookup(splitext(name)[1].lower(), "📄")
+            for name, is_dir in zip(filenames, is_dirs)]
 
 def split_path(path):
     """
@@ -186,18 +263,19 @@ def split_path(path):
     Returns:
         list: Path components
     """
-    components = []
-    while True:
-        head, tail = os.path.split(path)
-        if tail:
-            components.append(tail)
-        if not head or head == path:
-            if head:
-                components.append(head)
-            break
-        path = head
-    
-    components.reverse()
+    path = os.fspath(path)
+    if not path:
+        return []
+    
+    drive, rest = os.path.splitdrive(path)
+    components = [part for part in rest.split(os.sep) if part]
+    
+    # Keep the root as its own component
+    if drive:
+        components.insert(0, drive + os.sep)
+    elif rest.startswith(os.sep):
+        components.insert(0, os.sep)
+    
     return components
 
 def get_disk_usage(path):
@@ -210,6 +288,11 @@ def get_disk_usage(path):
     Returns:
         dict: Total, used, free bytes and percentages
     """
+    now = time.monotonic()
+    cached = _STATVFS_CACHE.get(path)
+    if cached and now - cached[0] < _STATVFS_TTL:
+        return dict(cached[1])
+    
     try:
         stat = os.statvfs(path)
         
@@ -217,13 +300,15 @@ def get_disk_usage(path):
         free = stat.f_bfree * stat.f_frsize
         used = total - free
         
-        return {
+        usage = {
             'total': total,
             'used': used,
             'free': free,
             'percent_used': (used / total * 100) if total > 0 else 0,
             'percent_free': (free / total * 100) if total > 0 else 0
         }
+        _STATVFS_CACHE[path] = (now, usage)
+        return dict(usage)
     except Exception as e:
         return {
             'total': 0,
@@ -234,6 +319,15 @@ def get_disk_usage(path):
             'error': str(e)
         }
 
+def _invalidate_disk_usage(path=None):
+    """Forget cached usage for path, or for all paths (e.g. after a large write)"""
+    if path is None:
+        _STATVFS_CACHE.clear()
+    else:
+        _STATVFS_CACHE.pop(path, None)
+
+get_disk_usage.invalidate = _invalidate_disk_usage
+
 def calculate_transfer_time(size_bytes, speed_bps):
     """
     Calculate estimated transfer time
@@ -263,25 +357,29 @@ def format_transfer_speed(bytes_per_second):
     """
     return format_size(bytes_per_second) + "/s"
 
-def is_binary_file(filepath, sample_size=1024):
+def is_binary_file(filepath=None, *, chunk=None, sample_size=1024):
     """
     Check if file is binary
     
     Args:
         filepath: Path to file
+        chunk: Already read start of the file, skips opening filepath
         sample_size: Bytes to sample
     
     Returns:
         bool: True if binary
     """
-    try:
-        with open(filepath, 'rb') as f:
-            chunk = f.read(sample_size)
-            if b'\x00' in chunk:
-                return True
-        return False
-    except:
-        return True
+    if chunk is None:
+        try:
+            fd = os.open(filepath, os.O_RDONLY)
+            try:
+                chunk = os.read(fd, sample_size)
+            finally:
+                os.close(fd)
+        except:
+            return True
+    
+    return bool(chunk[:sample_size].translate(None, _TEXTCHARS))
 
 def get_mime_type(filename):
     """
@@ -295,42 +393,22 @@ def get_mime_type(filename):
     """
     ext = os.path.splitext(filename)[1].lower()
     
-    mime_types = {
-        # Images
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.bmp': 'image/bmp',
-        '.webp': 'image/webp',
-        
-        # Video
-        '.mp4': 'video/mp4',
-        '.mkv': 'video/x-matroska',
-        '.avi': 'video/x-msvideo',
-        '.ts': 'video/mp2t',
-        '.mov': 'video/quicktime',
-        
-        # Audio
-        '.mp3': 'audio/mpeg',
-        '.flac': 'audio/flac',
-        '.wav': 'audio/wav',
-        '.ogg': 'audio/ogg',
-        '.m4a': 'audio/mp4',
-        
-        # Archives
-        '.zip': 'application/zip',
-        '.tar': 'application/x-tar',
-        '.gz': 'application/gzip',
-        '.rar': 'application/x-rar-compressed',
-        '.7z': 'application/x-7z-compressed',
-        
-        # Documents
-        '.pdf': 'application/pdf',
-        '.txt': 'text/plain',
-        '.html': 'text/html',
-        '.xml': 'application/xml',
-        '.json': 'application/json',
-    }
-    
-    return mime_types.get(ext, 'application/octet-stream')
\ No newline at end of file
+    # Recordings dominate receiver listings - skip the dict lookup for them
+    if ext == '.ts':
+        return 'video/mp2t'
+    
+    return _MIME_TYPES.get(ext, 'application/octet-stream')
+
+def get_mime_types_batch(filenames):
+    """
+    Guess MIME types for many files at once
+    
+    Args:
+        filenames: List of filenames
+    
+    Returns:
+        list: MIME types
+    """
+    lookup = _MIME_TYPES.get
+    splitext = os.path.splitext
+    return [lookup(splitext(name)[1].lower(), 'application/octet-stream') for name in filenames]
\ No newline at end of file
@@ -1,9 +1,53 @@
 # -*- coding: utf-8 -*-
 import logging
+import logging.handlers
 import os
+import atexit
+import threading
 from datetime import datetime
 from Components.config import config
 
+class BufferedFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Size-rotated file handler that batches writes
+    Records are flushed to disk at WARNING and above, at exit, or when the buffer fills
+    """
+    
+    BUFFER_SIZE = 8192
+    
+    def __init__(self, filename, maxBytes=0, backupCount=0):
+        logging.handlers.RotatingFileHandler.__init__(
+            self, filename, maxBytes=maxBytes, backupCount=backupCount, delay=True)
+        # Tracked here - the stock handler seeks to the end per record,
+        # which would flush the buffer every time
+        self.size = 0
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE, encoding=self.encoding)
+        self.size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            
+            msg = self.format(record) + self.terminator
+            if self.maxBytes > 0 and self.size + len(msg) >= self.maxBytes:
+                self.doRollover()
+                self.stream = self._open()
+            
+            self.stream.write(msg)
+            self.size += len(msg)
+            if record.levelno >= logging.WARNING:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+# One Logger per name, shared by every module that asks for it
+_LOGGERS = {}
+_LOGGERS_LOCK = threading.Lock()
+
 class Logger:
     """Configurable logging system for the file manager"""
     
@@ -15,29 +59,69 @@ class Logger:
         'CRITICAL': logging.CRITICAL
     }
     
+    # Log file rotation
+    LOG_MAX_BYTES = 1000000
+    LOG_BACKUPS = 2
+    
+    def __new__(cls, name="AdvancedFileManager", level=None):
+        with _LOGGERS_LOCK:
+            instance = _LOGGERS.get(name)
+            if instance is None:
+                instance = _LOGGERS[name] = super().__new__(cls)
+                instance._initialized = False
+            return instance
+    
     def __init__(self, name="AdvancedFileManager", level=None):
+        if self._initialized:
+            # Shared instance - pick up a level changed in the settings since
+            self.set_level(level if level is not None else self._config_level())
+            return
+        
         self.name = name
         self.logger = logging.getLogger(name)
         
         # Set level from config or parameter
         if level is None:
-            level = getattr(config.plugins.advancedfilemanager, 'log_level', 'INFO')
+            level = self._config_level()
         
         self.logger.setLevel(self.LEVELS.get(level, logging.INFO))
         
-        # Prevent duplicate handlers
-        if not self.logger.handlers:
-            self._setup_handlers()
+        # Handlers (and the log file) are set up by the first emitted record
+        self._handlers_ready = False
+        self._initialized = True
+    
+    @staticmethod
+    def _config_level():
+        """Log level name selected in the plugin settings"""
+        level_config = getattr(config.plugins.advancedfilemanager, 'log_level', None)
+        return level_config.value if level_config is not None else 'INFO'
+    
+    def set_level(self, level):
+        """Change the level of the logger and its file handler"""
+        level = self.LEVELS.get(level, logging.INFO)
+        self.logger.setLevel(level)
+        for handler in self.logger.handlers:
+            if isinstance(handler, BufferedFileHandler):
+                handler.setLevel(level)
     
     def _setup_handlers(self):
         """Setup file and console handlers"""
+        with _LOGGERS_LOCK:
+            # The stdlib logger may already be set up by another instance
+            if not self.logger.handlers:
+                self._add_handlers()
+            self._handlers_ready = True
+    
+    def _add_handlers(self):
+        """Attach file and console handlers to the stdlib logger"""
         # Log file path
         log_dir = "/tmp"
         log_file = os.path.join(log_dir, f"{self.name.lower()}.log")
         
         # File handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
+        file_handler = BufferedFileHandler(log_file, maxBytes=self.LOG_MAX_BYTES, backupCount=self.LOG_BACKUPS)
+        atexit.register(file_handler.flush)
+        file_handler.setLevel(self.logger.level)
         file_format = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
@@ -45,27 +129,40 @@ class Logger:
         file_handler.setFormatter(file_format)
         self.logger.addHandler(file_handler)
         
-        # Console handler (for debugging)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.WARNING)
-        console_format = logging.Formatter('%(levelname)s: %(message)s')
-        console_handler.setFormatter(console_format)
-        self.logger.addHandler(console_handler)
+        # Console handler (for debugging only)
+        if self.logger.level <= logging.DEBUG or os.environ.get('AFM_LOG_CONSOLE') == '1':
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.WARNING)
+            console_format = logging.Formatter('%(levelname)s: %(message)s')
+            console_handler.setFormatter(console_format)
+            self.logger.addHandler(console_handler)
+    
+    def _log(self, level, message, args):
+        if self.logger.isEnabledFor(level):
+            if not self._handlers_ready:
+                self._setup_handlers()
+            self.logger.log(level, message, *args)
+    
+    # Extra args are %-formatted only if the record is actually emitted
+    def debug(self, message, *args):
+        self._log(logging.DEBUG, message, args)
     
-    def debug(self, message):
-        self.logger.debug(message)
+    def info(self, message, *args):
+        self._log(logging.INFO, message, args)
     
-    def info(self, message):
-        self.logger.info(message)
+    def warning(self, message, *args):
+        self._log(logging.WARNING, message, args)
     
-    def warning(self, message):
-        self.logger.warning(message)
+    def error(self, message, *args):
+        self._log(logging.ERROR, message, args)
     
-    def error(self, message):
-        self.logger.error(message)
+    def critical(self, message, *args):
+        self._log(logging.CRITICAL, message, args)
     
-    def critical(self, message):
-        self.logger.critical(message)
+    def flush(self):
+        """Write buffered records to the log file"""
+        for handler in self.logger.handlers:
+            handler.flush()
     
     def log_operation(self, operation, details, success=True):
         """Log file operation with details"""
@@ -80,9 +177,13 @@ class Logger:
         """Clear log file"""
         try:
             log_path = self.get_log_path()
+            self.flush()
             if os.path.exists(log_path):
                 with open(log_path, 'w'):
                     pass
+                for handler in self.logger.handlers:
+                    if isinstance(handler, BufferedFileHandler):
+                        handler.size = 0
                 return True
         except Exception as e:
             self.error(f"Failed to clear logs: {e}")
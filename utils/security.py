@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+import time
+import threading
+from collections import OrderedDict
 
 class SecurityManager:
     """Security utilities for path validation and sanitization"""
@@ -13,12 +16,139 @@ class SecurityManager:
         '/boot', '/var/log', '/var/spool'
     ]
     
+    # FORBIDDEN_PATHS or anything below them, group 1 is the matched entry
+    _FORBIDDEN_RE = re.compile('^(' + '|'.join(map(re.escape, FORBIDDEN_PATHS)) + ')(?:/|$)')
+    
     # Dangerous characters in filenames
     DANGEROUS_CHARS = ['<', '>', ':', '"', '|', '?', '*', '\x00']
     
+    # str.translate() table for sanitize_filename: control characters and
+    # DEL are dropped, dangerous ones (including NUL) become '_'
+    _SANI_TABLE = str.maketrans({
+        **{chr(i): None for i in range(32)},
+        '\x7f': None,
+        **{c: '_' for c in DANGEROUS_CHARS},
+    })
+    
+    # Anything _SANI_TABLE would change
+    _BAD_RE = re.compile('[' + re.escape(''.join(DANGEROUS_CHARS)) + '\x00-\x1f\x7f]')
+    
+    # Reserved device names (Windows compatibility)
+    RESERVED_NAMES = frozenset({
+        'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3',
+        'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+        'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6',
+        'LPT7', 'LPT8', 'LPT9'
+    })
+    
     # Maximum symlink resolution depth
     MAX_SYMLINK_DEPTH = 5
     
+    # Access mode checked on the path itself, delete is handled separately
+    _OP_MODES = {'read': os.R_OK, 'write': os.W_OK, 'execute': os.X_OK}
+    
+    # validate_path() results are reused for this many seconds
+    VALIDATE_CACHE_TTL = 0.5
+    VALIDATE_CACHE_SIZE = 1024
+    
+    def __init__(self):
+        # (path, allow_write) -> (timestamp, real_path), oldest first
+        self._validate_cache = OrderedDict()
+        # directory -> (timestamp, realpath of directory), oldest first
+        self._parent_cache = OrderedDict()
+        # path -> (timestamp, os.stat result), oldest first
+        self._stat_cache = OrderedDict()
+        
+        # Credentials for permission checks from stat results
+        self._euid = os.geteuid()
+        self._groups = frozenset(os.getgroups()) | {os.getegid()}
+        # Shared with the file operation worker threads
+        self._validate_lock = threading.Lock()
+    
+    def clear_cache(self):
+        """Forget cached validate_path() results"""
+        with self._validate_lock:
+            self._validate_cache.clear()
+            self._parent_cache.clear()
+            self._stat_cache.clear()
+    
+    def _forget(self, *paths):
+        """Drop cached results for paths and their parent directories"""
+        with self._validate_lock:
+            for path in paths:
+                # Removing path leaves its parent's real path unchanged
+                self._parent_cache.pop(path, None)
+                for p in (path, os.path.dirname(path)):
+                    self._validate_cache.pop((p, False), None)
+                    self._validate_cache.pop((p, True), None)
+                    self._stat_cache.pop(p, None)
+    
+    def _stat(self, path):
+        """os.stat() reused for VALIDATE_CACHE_TTL, None if path is inaccessible"""
+        now = time.monotonic()
+        with self._validate_lock:
+            cached = self._stat_cache.get(path)
+        if cached and now - cached[0] < self.VALIDATE_CACHE_TTL:
+            return cached[1]
+        
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        
+        with self._validate_lock:
+            self._stat_cache[path] = (now, st)
+            self._stat_cache.move_to_end(path)
+            if len(self._stat_cache) > self.VALIDATE_CACHE_SIZE:
+                self._stat_cache.popitem(last=False)
+        return st
+    
+    def _has_access(self, path, st, mode):
+        """
+        os.access() answered from the mode bits of a stat result
+        
+        Root bypasses mode bits and write access also depends on the mount
+        being read-write, so those cases still ask the kernel.
+        """
+        if self._euid == 0 or mode & os.W_OK:
+            return os.access(path, mode)
+        
+        if st.st_uid == self._euid:
+            mode <<= 6
+        elif st.st_gid in self._groups:
+            mode <<= 3
+        return st.st_mode & mode == mode
+    
+    def _resolve_path(self, path):
+        """
+        os.path.realpath() that reuses recently resolved parent directories
+        
+        Only the leaf is checked for being a symlink; intermediate links are
+        still honoured through the parent's real path.
+        """
+        if '..' in path.split(os.sep):
+            return os.path.realpath(path)
+        
+        norm = os.path.abspath(path)
+        parent, leaf = os.path.split(norm)
+        if not leaf or os.path.islink(norm):
+            return os.path.realpath(norm)
+        
+        now = time.monotonic()
+        with self._validate_lock:
+            cached = self._parent_cache.get(parent)
+        if cached and now - cached[0] < self.VALIDATE_CACHE_TTL:
+            real_parent = cached[1]
+        else:
+            real_parent = os.path.realpath(parent)
+            with self._validate_lock:
+                self._parent_cache[parent] = (now, real_parent)
+                self._parent_cache.move_to_end(parent)
+                if len(self._parent_cache) > self.VALIDATE_CACHE_SIZE:
+                    self._parent_cache.popitem(last=False)
+        
+        return os.path.join(real_parent, leaf)
+    
     def validate_path(self, path, allow_write=False, _depth=0):
         """
         Validate path for security issues
@@ -40,23 +170,31 @@ class SecurityManager:
         if not path or not isinstance(path, str):
             raise SecurityError("Invalid path type")
         
+        if _depth == 0:
+            key = (path, allow_write)
+            now = time.monotonic()
+            with self._validate_lock:
+                cached = self._validate_cache.get(key)
+                if cached and now - cached[0] < self.VALIDATE_CACHE_TTL:
+                    self._validate_cache.move_to_end(key)
+                    return cached[1]
+        
         # Normalize path
         try:
-            real_path = os.path.realpath(path)
+            real_path = self._resolve_path(path)
         except Exception as e:
             raise SecurityError(f"Path resolution failed: {e}")
         
         # Check for directory traversal - verify resolved path doesn't escape
         if '..' in path.split(os.sep):
             # Ensure the resolved path is still safe
-            if any(real_path.startswith(forbidden) for forbidden in self.FORBIDDEN_PATHS):
+            if self._FORBIDDEN_RE.match(real_path):
                 raise SecurityError("Directory traversal attempt detected")
         
-        # Check forbidden paths
-        for forbidden in self.FORBIDDEN_PATHS:
-            # Check exact match or subdirectory
-            if real_path == forbidden or real_path.startswith(forbidden + os.sep):
-                raise SecurityError(f"Access denied to system path: {forbidden}")
+        # Check forbidden paths (exact match or subdirectory)
+        match = self._FORBIDDEN_RE.match(real_path)
+        if match:
+            raise SecurityError(f"Access denied to system path: {match.group(1)}")
         
         # Check for symlinks pointing to forbidden areas
         if os.path.islink(path):
@@ -70,6 +208,13 @@ class SecurityManager:
             except SecurityError:
                 raise SecurityError("Symlink points to forbidden location")
         
+        if _depth == 0:
+            with self._validate_lock:
+                self._validate_cache[key] = (now, real_path)
+                self._validate_cache.move_to_end(key)
+                if len(self._validate_cache) > self.VALIDATE_CACHE_SIZE:
+                    self._validate_cache.popitem(last=False)
+        
         return real_path
     
     def sanitize_filename(self, filename):
@@ -77,22 +222,19 @@ class SecurityManager:
         if not filename:
             return "unnamed"
         
-        # Remove dangerous characters
-        for char in self.DANGEROUS_CHARS:
-            filename = filename.replace(char, '_')
+        # Already clean names are returned as they are
+        if (len(filename) <= 255 and not self._BAD_RE.search(filename)
+                and filename.upper().split('.')[0] not in self.RESERVED_NAMES
+                and filename.strip('.')):
+            return filename
         
-        # Remove control characters
-        filename = ''.join(char for char in filename if ord(char) >= 32)
+        # Replace dangerous characters and remove control characters in one pass
+        filename = filename.translate(self._SANI_TABLE)
         
         # Prevent reserved names (Windows compatibility)
-        reserved = ['CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 
-                   'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-                   'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 
-                   'LPT7', 'LPT8', 'LPT9']
-        
         name_upper = filename.upper()
         base_name = name_upper.split('.')[0] if '.' in name_upper else name_upper
-        if base_name in reserved:
+        if base_name in self.RESERVED_NAMES:
             filename = f"_{filename}"
         
         # Limit length
@@ -120,20 +262,19 @@ class SecurityManager:
         try:
             path = self.validate_path(path, allow_write=(operation in ['write', 'delete']))
             
-            if not os.path.exists(path):
+            st = self._stat(path)
+            if st is None:
                 # For delete/write, check parent directory
                 if operation in ['write', 'delete']:
                     path = os.path.dirname(path)
                 else:
                     return False
             
-            if operation == 'read':
-                return os.access(path, os.R_OK)
-            elif operation == 'write':
-                return os.access(path, os.W_OK)
-            elif operation == 'execute':
-                return os.access(path, os.X_OK)
-            elif operation == 'delete':
+            mode = self._OP_MODES.get(operation)
+            if mode is not None:
+                return self._has_access(path, st, mode)
+            
+            if operation == 'delete':
                 # Need write permission on parent directory
                 parent = os.path.dirname(path)
                 return os.access(parent, os.W_OK) and os.access(path, os.W_OK)
@@ -160,7 +301,7 @@ class SecurityManager:
             src_real = self.validate_path(src)
             
             # Check source exists
-            if not os.path.exists(src_real):
+            if self._stat(src_real) is None:
                 return False, "Source does not exist"
             
             # Check source permissions
@@ -175,23 +316,26 @@ class SecurityManager:
                     return False, f"Invalid destination: {e}"
                 
                 dst_parent = os.path.dirname(dst_real)
-                if not os.path.exists(dst_parent):
+                if self._stat(dst_parent) is None:
                     return False, "Destination directory does not exist"
                 
                 if not self.check_permissions(dst_parent, 'write'):
                     return False, "No write permission on destination directory"
                 
                 # Prevent overwriting system files
-                if os.path.exists(dst_real):
-                    for forbidden in self.FORBIDDEN_PATHS:
-                        if dst_real == forbidden or dst_real.startswith(forbidden + os.sep):
-                            return False, "Cannot overwrite system file"
+                if os.path.exists(dst_real) and self._FORBIDDEN_RE.match(dst_real):
+                    return False, "Cannot overwrite system file"
             
             # Specific checks for operations
             if operation == 'delete':
                 if not self.check_permissions(src_real, 'delete'):
                     return False, "No permission to delete"
             
+            # The caller is about to remove src - drop its stale results but
+            # keep the rest of the cache for the other items of a batch
+            if operation in ('delete', 'move'):
+                self._forget(src, src_real)
+            
             return True, "Safe"
             
         except SecurityError as e: